@@ -0,0 +1,114 @@
+"""
+AURA-ATS offline batch ranking
+Scores every job against every candidate without going through the HTTP API
+
+Usage:
+    python -m app.batch --jobs jobs.ndjson --candidates candidates.parquet \
+        --output rankings.ndjson --top-k 100
+
+Inputs are NDJSON or Parquet exports of Job/Candidate records (requiredSkills,
+requiredExperience, requiredCerts, *Weight / skills, experience,
+certifications, optional embedding + embeddingModel; jobs may also carry an
+embeddings map of per-model vectors). semanticScore compares each candidate
+with the job vector from its own model. Output is NDJSON with one line per job,
+or Parquet with one row per (job, candidate) when the path ends in .parquet.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+
+from app.services.batch_scorer import COMPONENTS, BatchScoringService
+from app.services.embedding import EmbeddingService
+
+load_dotenv()
+
+
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def _require_pandas():
+    try:
+        import pandas as pd
+        return pd
+    except ImportError:
+        raise SystemExit("Parquet support requires pandas and pyarrow: pip install pandas pyarrow")
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Read records from an NDJSON or Parquet file"""
+    if _is_parquet(path):
+        pd = _require_pandas()
+        records = pd.read_parquet(path).to_dict(orient="records")
+        # Parquet lists arrive as numpy arrays
+        return [
+            {k: v.tolist() if hasattr(v, "tolist") else v for k, v in record.items()}
+            for record in records
+        ]
+
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_rankings(path: str, rankings: List[Dict[str, Any]]) -> None:
+    """Write rankings as NDJSON (one job per line) or long-format Parquet"""
+    if _is_parquet(path):
+        pd = _require_pandas()
+        rows = [
+            {"jobId": job["jobId"], **candidate}
+            for job in rankings
+            for candidate in job["candidates"]
+        ]
+        columns = ["jobId", "rank", "candidateId"] + COMPONENTS
+        pd.DataFrame(rows, columns=columns).to_parquet(path, index=False)
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        for job in rankings:
+            f.write(json.dumps(job) + "\n")
+
+
+async def run(args: argparse.Namespace) -> None:
+    jobs = load_records(args.jobs)
+    candidates = load_records(args.candidates)
+    print(f"Loaded {len(jobs)} jobs and {len(candidates)} candidates")
+
+    service = BatchScoringService(
+        EmbeddingService(),
+        max_workers=args.workers,
+        memory_mb=args.memory_mb,
+        block_size=args.block_size,
+    )
+
+    started = time.perf_counter()
+    rankings = await service.rank(jobs, candidates, top_k=args.top_k, model=args.model)
+    print(f"Scored {len(jobs) * len(candidates)} pairs in {time.perf_counter() - started:.1f}s")
+
+    write_rankings(args.output, rankings)
+    print(f"Wrote top-{args.top_k} rankings to {args.output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rank all candidates for all jobs offline")
+    parser.add_argument("--jobs", required=True, help="Jobs file (.ndjson/.jsonl or .parquet)")
+    parser.add_argument("--candidates", required=True, help="Candidates file (.ndjson/.jsonl or .parquet)")
+    parser.add_argument("--output", required=True, help="Output file (.ndjson or .parquet)")
+    parser.add_argument("--model", default=None, help="Embedding model for skill/cert matching")
+    parser.add_argument("--top-k", type=int, default=50, help="Candidates kept per job")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--memory-mb", type=int, default=1024, help="Memory budget for score blocks")
+    parser.add_argument("--block-size", type=int, default=None, help="Candidates per block (overrides --memory-mb)")
+    try:
+        asyncio.run(run(parser.parse_args()))
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ FastAPI service for resume parsing, embedding generation, and semantic scoring
 from fastapi import FastAPI, HTTPException, File, UploadFile, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
 
@@ -15,8 +16,14 @@ from app.models.resume import ResumeParseRequest, ResumeParseResponse
 from app.models.job import JobDescription
 from app.models.score import ScoreRequest, ScoreResponse
 from app.services.parser import ResumeParser
-from app.services.embedding import EmbeddingService
+from app.services.ocr import OCRService
+from app.services.embedding import (
+    EmbeddingService,
+    IncompatibleEmbeddingError,
+    MODEL_REGISTRY,
+)
 from app.services.scorer import ScoringService
+from app.utils.nlp import detect_language
 
 load_dotenv()
 
@@ -39,7 +46,8 @@ app.add_middleware(
 security = HTTPBearer()
 
 # Initialize services
-parser = ResumeParser()
+ocr_service = OCRService()
+parser = ResumeParser(ocr_service)
 embedding_service = EmbeddingService()
 scoring_service = ScoringService(embedding_service)
 
@@ -48,42 +56,137 @@ app.include_router(router, prefix="/api", tags=["api"])
 app.include_router(generate_insights.router, prefix="/api", tags=["ai"])
 
 
+def embedding_tags(model: str) -> dict:
+    """Model id and dimension stored alongside every embedding"""
+    spec = embedding_service.get_model_spec(model)
+    return {"embeddingModel": spec.id, "embeddingDimension": spec.dimension}
+
+
+async def embed_resumes(
+    parsed: List[ResumeParseResponse], model: Optional[str] = None
+) -> List[dict]:
+    """
+    Attach embeddings to parsed resumes
+    Each resume uses the requested model, or the model for its detected
+    language. All sections of all resumes for a model are embedded in one
+    batch; the resume embedding is their weighted combination (full text
+    when no sections were found or none had text)
+    """
+    groups: Dict[str, List[int]] = {}
+    for i, parsed_data in enumerate(parsed):
+        resume_model = model or embedding_service.model_for_language(parsed_data.language)
+        groups.setdefault(resume_model, []).append(i)
+    
+    results: List[dict] = [{} for _ in parsed]
+    for resume_model, indices in groups.items():
+        section_embeddings = await embedding_service.generate_section_embeddings(
+            [parsed[i].sections or {"text": parsed[i].text} for i in indices],
+            resume_model,
+        )
+        # Nothing extractable (e.g. a scan without OCR): embed the raw text,
+        # even if empty, rather than combining no sections
+        empty = [i for i, embeddings in zip(indices, section_embeddings) if not embeddings]
+        if empty:
+            fallback = await embedding_service.generate_embeddings(
+                [parsed[i].text for i in empty], resume_model
+            )
+            fallback_by_index = dict(zip(empty, fallback))
+        for i, embeddings in zip(indices, section_embeddings):
+            response_dict = parsed[i].dict()
+            if embeddings:
+                embedding = embedding_service.combine_section_embeddings(embeddings)
+            else:
+                embedding = fallback_by_index[i]
+            response_dict['embedding'] = embedding.tolist()  # Convert numpy array to list
+            if parsed[i].sections:
+                response_dict['section_embeddings'] = {
+                    name: embedding.tolist() for name, embedding in embeddings.items()
+                }
+            response_dict.update(embedding_tags(resume_model))
+            results[i] = response_dict
+    return results
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    ocr_service.shutdown()
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "service": "aura-ats-ai"}
 
 
+@app.get("/api/models")
+async def list_models():
+    """
+    Registered embedding models and which ones are currently loaded
+    """
+    return {
+        "default": embedding_service.default_model,
+        "loaded": embedding_service.loaded_models(),
+        "models": [
+            {"id": spec.id, "provider": spec.provider, "dimension": spec.dimension,
+             "languages": list(spec.languages)}
+            for spec in MODEL_REGISTRY.values()
+        ],
+    }
+
+
 @app.post("/api/parse")
-async def parse_resume(file: UploadFile = File(...)):
+async def parse_resume(file: UploadFile = File(...), model: Optional[str] = None):
     """
     Parse a PDF resume and extract structured data + generate embedding
-    Returns: parsed data with embedding vector (384 dimensions)
+    Returns: parsed data with sections, per-section embeddings and the
+    weighted resume embedding, tagged with embeddingModel/embeddingDimension
+    (model defaults to the one for the resume's detected language)
     """
     try:
         content = await file.read()
         parsed_data = await parser.parse_pdf(content)
         
-        # Generate embedding for the resume text
-        embedding = await embedding_service.generate_embedding(parsed_data.text)
+        # Generate section embeddings and the combined resume embedding
+        results = await embed_resumes([parsed_data], model)
+        
+        return results[0]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Parsing failed: {str(e)}")
+
+
+@app.post("/api/parse/batch")
+async def parse_resumes(files: List[UploadFile] = File(...), model: Optional[str] = None):
+    """
+    Parse multiple PDF resumes in one request (bulk upload)
+    Experience and embeddings are computed for the whole batch at once
+    """
+    try:
+        contents = [await file.read() for file in files]
+        parsed = await parser.parse_pdfs(contents)
         
-        # Add embedding to response
-        response_dict = parsed_data.dict()
-        response_dict['embedding'] = embedding.tolist()  # Convert numpy array to list
+        results = await embed_resumes(parsed, model)
         
-        return response_dict
+        return {"results": results}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Parsing failed: {str(e)}")
 
 
 @app.post("/api/embed")
-async def generate_embedding(text: str):
+async def generate_embedding(text: str, model: Optional[str] = None):
     """
     Generate embedding vector for text
-    Returns: embedding vector (384 dimensions)
+    Model defaults to the one for the text's detected language, as in /api/parse
+    Returns: embedding vector tagged with embeddingModel/embeddingDimension
     """
     try:
-        embedding = await embedding_service.generate_embedding(text)
-        return {"embedding": embedding.tolist()}
+        model = model or embedding_service.model_for_language(detect_language(text))
+        embedding = await embedding_service.generate_embedding(text, model)
+        return {"embedding": embedding.tolist(), **embedding_tags(model)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Embedding generation failed: {str(e)}")
 
@@ -105,21 +208,43 @@ async def calculate_score(request: ScoreRequest):
             job_experience=request.job.requiredExperience,
             job_certs=request.job.requiredCerts,
             weights=request.weights,
+            include_explanation=request.includeExplanation,
+            model=request.model,
+            candidate_embedding=request.candidate.embedding,
+            candidate_embedding_model=request.candidate.embeddingModel,
+            job_embedding=request.job.embedding,
+            job_embedding_model=request.job.embeddingModel,
         )
         return score_result
+    except IncompatibleEmbeddingError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
 
 
 @app.post("/api/job/embed")
-async def generate_job_embedding(description: str):
+async def generate_job_embedding(description: str, model: Optional[str] = None):
     """
     Generate embedding for job description
-    Used when creating/updating jobs
+    Used when creating/updating jobs. Without a model, the description is
+    embedded with every model resumes can be routed to; "embeddings" maps
+    each model id to its vector and "embedding" is the default model's
     """
     try:
-        embedding = await embedding_service.generate_embedding(description)
-        return {"embedding": embedding.tolist()}
+        models = [model] if model else embedding_service.resume_models()
+        embeddings = {
+            job_model: (await embedding_service.generate_embedding(description, job_model)).tolist()
+            for job_model in models
+        }
+        return {
+            "embedding": embeddings[models[0]],
+            "embeddings": embeddings,
+            **embedding_tags(models[0]),
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Job embedding generation failed: {str(e)}")
 
@@ -6,3 +6,5 @@ class JobDescription(BaseModel):
     requiredSkills: List[str]
     requiredExperience: Optional[int]
     requiredCerts: List[str]
+    embedding: Optional[List[float]] = None
+    embeddingModel: Optional[str] = None
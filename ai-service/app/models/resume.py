@@ -14,9 +14,13 @@ class ResumeParseResponse(BaseModel):
     education: Optional[Dict[str, Any]]
     work_history: Optional[List[Dict[str, Any]]]
     personal_info: Optional[Dict[str, str]]
+    sections: Optional[Dict[str, str]] = None
+    language: Optional[str] = None
 
 
 class CandidateProfile(BaseModel):
     skills: List[str]
     experience: Optional[int]
     certifications: List[str]
+    embedding: Optional[List[float]] = None
+    embeddingModel: Optional[str] = None
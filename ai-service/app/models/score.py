@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from app.models.resume import CandidateProfile
 from app.models.job import JobDescription
 
@@ -14,6 +14,20 @@ class ScoreRequest(BaseModel):
     candidate: CandidateProfile
     job: JobDescription
     weights: Weights
+    includeExplanation: bool = True  # Set False in bulk scoring to skip prose
+    model: Optional[str] = None  # Embedding model for skill/cert matching
+
+
+class TermMatch(BaseModel):
+    requirement: str
+    bestMatch: Optional[str] = None
+    similarity: float
+    matched: bool
+
+
+class MatchDetails(BaseModel):
+    skills: List[TermMatch]
+    certifications: List[TermMatch]
 
 
 class ScoreResponse(BaseModel):
@@ -21,4 +35,6 @@ class ScoreResponse(BaseModel):
     skillsScore: float
     experienceScore: float
     certsScore: float
+    semanticScore: Optional[float] = None  # Resume vs job embedding, when both given
     explanation: Optional[str] = None
+    match: Optional[MatchDetails] = None
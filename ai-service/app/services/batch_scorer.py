@@ -0,0 +1,436 @@
+"""
+Batch Scoring Service
+Computes the full jobs x candidates score matrix offline, using the same
+formula as ScoringService, in memory-bounded candidate blocks spread across
+worker processes. Only the top-k candidates per job are kept.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.services.embedding import EmbeddingService
+
+
+# Component order in score arrays
+COMPONENTS = ["overallScore", "skillsScore", "experienceScore", "certsScore", "semanticScore"]
+
+DEFAULT_WEIGHTS = (0.6, 0.3, 0.1)
+
+# Per-process job-side state, set once by _init_worker
+_state: Dict[str, Any] = {}
+
+
+def _names(values: Optional[List[Any]]) -> List[str]:
+    """Skill/cert names from strings or {name: ...} objects (backend format)"""
+    names = []
+    for value in values or []:
+        name = value.get("name") if isinstance(value, dict) else value
+        if name:
+            names.append(str(name))
+    return names
+
+
+def _record_id(record: Dict[str, Any]) -> str:
+    value = record.get("id", record.get("_id"))
+    if isinstance(value, dict):  # Mongo extended JSON {"$oid": ...}
+        value = value.get("$oid")
+    return str(value)
+
+
+def _years(value: Any) -> float:
+    """Experience years; missing or zero counts as no value (NaN)"""
+    return float(value) if value else np.nan
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _padded_index(term_lists: List[List[str]], vocab: Dict[str, int]) -> np.ndarray:
+    """Rows of vocabulary indices padded with -1 to the longest list"""
+    width = max((len(terms) for terms in term_lists), default=0)
+    index = np.full((len(term_lists), width), -1, dtype=np.int32)
+    for row, terms in enumerate(term_lists):
+        index[row, :len(terms)] = [vocab[term] for term in terms]
+    return index
+
+
+def _mean_matrix(term_lists: List[List[str]], vocab: Dict[str, int]) -> sparse.csr_matrix:
+    """Sparse rows averaging over each list's vocabulary entries"""
+    rows, cols, values = [], [], []
+    for row, terms in enumerate(term_lists):
+        for term in terms:
+            rows.append(row)
+            cols.append(vocab[term])
+            values.append(1.0 / len(terms))
+    return sparse.csr_matrix(
+        (values, (rows, cols)), shape=(len(term_lists), len(vocab)), dtype=np.float32
+    )
+
+
+def _best_match(similarity: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """
+    Best candidate-term similarity for every job term: (job terms x block)
+    Padding scores 0, which is also ScoringService's starting best match
+    """
+    if index.shape[1] == 0:
+        return np.zeros((similarity.shape[0], index.shape[0]), dtype=np.float32)
+    gathered = similarity[:, np.maximum(index, 0)]
+    gathered = np.where(index >= 0, gathered, 0.0)
+    return gathered.max(axis=2)
+
+
+def _state_bytes(state: Any) -> int:
+    """Memory held by the job-side state arrays (dense and sparse, nested)"""
+    if sparse.issparse(state):
+        return state.data.nbytes + state.indices.nbytes + state.indptr.nbytes
+    if isinstance(state, np.ndarray):
+        return state.nbytes
+    if isinstance(state, dict):
+        return sum(_state_bytes(value) for value in state.values())
+    if isinstance(state, (list, tuple)):
+        return sum(_state_bytes(value) for value in state)
+    return 0
+
+
+def _job_vector(job: Dict[str, Any], model: Optional[str]) -> Optional[List[float]]:
+    """
+    A job's description vector from the given embedding model: its per-model
+    embeddings map, or its main embedding when that carries the same tag
+    (untagged jobs only match untagged candidates)
+    """
+    vectors = job.get("embeddings") or {}
+    if model is not None and vectors.get(model) is not None:
+        return vectors[model]
+    if job.get("embeddingModel") == model:
+        return job.get("embedding")
+    return None
+
+
+def _init_worker(state: Dict[str, Any]) -> None:
+    _state.clear()
+    _state.update(state)
+
+
+def _score_block(block: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score one candidate block against all jobs
+    Returns global candidate indices (jobs x k) and their components (jobs x k x 5)
+    """
+    skills = _state["skill_mean"] @ _best_match(_state["skill_sim"], block["skill_index"])
+    skills[~_state["job_has_skills"]] = 100.0
+
+    certs = _state["cert_mean"] @ _best_match(_state["cert_sim"], block["cert_index"])
+    certs[~_state["job_has_certs"]] = 100.0
+
+    job_exp = _state["job_experience"][:, None]
+    candidate_exp = block["experience"][None, :]
+    experience = np.where(
+        np.isnan(job_exp),
+        100.0,
+        np.where(
+            np.isnan(candidate_exp), 0.0,
+            np.minimum(candidate_exp / job_exp, 1.0) * 100.0,
+        ),
+    )
+
+    weights = _state["job_weights"]
+    overall = (
+        skills * weights[:, 0:1]
+        + experience * weights[:, 1:2]
+        + certs * weights[:, 2:3]
+    )
+
+    # Each candidate is compared with the job vector from its own model;
+    # pairs without one stay NaN
+    semantic = np.full(overall.shape, np.nan)
+    for model, candidate_embeddings in block["embeddings"].items():
+        job_embeddings, job_has_embedding = _state["job_embeddings"][model]
+        in_model = block["has_embedding"] & (block["embedding_model"] == model)
+        same_model = job_has_embedding[:, None] & in_model[None, :]
+        scores = (job_embeddings @ candidate_embeddings.T + 1) / 2 * 100
+        semantic = np.where(same_model, scores, semantic)
+
+    k = min(_state["top_k"], overall.shape[1])
+    top = np.argpartition(-overall, k - 1, axis=1)[:, :k]
+    components = np.stack(
+        [np.take_along_axis(c, top, axis=1) for c in (overall, skills, experience, certs, semantic)],
+        axis=2,
+    )
+    return top + block["start"], components
+
+
+class BatchScoringService:
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        max_workers: Optional[int] = None,
+        memory_mb: int = 1024,
+        block_size: Optional[int] = None,
+    ):
+        """
+        memory_mb bounds the working set of all in-flight blocks together;
+        block_size overrides the size derived from it
+        """
+        self.embedding_service = embedding_service
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.memory_mb = memory_mb
+        self.block_size = block_size
+
+    async def _term_similarity(
+        self,
+        job_terms: List[List[str]],
+        candidate_terms: List[List[str]],
+        model: Optional[str] = None,
+    ) -> Tuple[Dict[str, int], Dict[str, int], np.ndarray]:
+        """
+        Vocabularies for job and candidate terms and their similarity
+        matrix on ScoringService's 0-100 scale, embedding each term once
+        """
+        job_vocab = {t: i for i, t in enumerate(dict.fromkeys(t for ts in job_terms for t in ts))}
+        candidate_vocab = {
+            t: i for i, t in enumerate(dict.fromkeys(t for ts in candidate_terms for t in ts))
+        }
+        if not job_vocab or not candidate_vocab:
+            return job_vocab, candidate_vocab, np.zeros(
+                (len(job_vocab), len(candidate_vocab)), dtype=np.float32
+            )
+
+        terms = list(dict.fromkeys(list(job_vocab) + list(candidate_vocab)))
+        embeddings = _unit_rows(np.asarray(
+            await self.embedding_service.generate_embeddings(terms, model), dtype=np.float32
+        ))
+        position = {t: i for i, t in enumerate(terms)}
+        job_embeddings = embeddings[[position[t] for t in job_vocab]]
+        candidate_embeddings = embeddings[[position[t] for t in candidate_vocab]]
+
+        similarity = (job_embeddings @ candidate_embeddings.T + 1) / 2 * 100
+        return job_vocab, candidate_vocab, similarity.astype(np.float32)
+
+    @staticmethod
+    def _embedding_matrix(
+        vectors: List[Optional[List[float]]], model: Optional[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Unit-normalized rows for one model's vectors (zeros where missing)
+        and a presence mask
+        """
+        has_embedding = np.array([v is not None and len(v) > 0 for v in vectors], dtype=bool)
+        dimension = len(next(v for v, ok in zip(vectors, has_embedding) if ok))
+        matrix = np.zeros((len(vectors), dimension), dtype=np.float32)
+        for row, (vector, ok) in enumerate(zip(vectors, has_embedding)):
+            if ok:
+                if len(vector) != dimension:
+                    raise ValueError(
+                        f"Embedding dimension mismatch for {model}: {len(vector)} vs {dimension}"
+                    )
+                matrix[row] = vector
+        return _unit_rows(matrix), has_embedding
+
+    def _semantic_state(
+        self, jobs: List[Dict[str, Any]], candidates: List[Dict[str, Any]]
+    ) -> Tuple[
+        Dict[Any, Tuple[np.ndarray, np.ndarray]], Dict[Any, np.ndarray], np.ndarray, np.ndarray
+    ]:
+        """
+        Per-model embedding matrices for semanticScore
+        Candidates are grouped by embeddingModel; for each model the jobs use
+        their vector from that model. Returns job-side (matrix, mask) and
+        candidate matrices keyed by model, each candidate's model and which
+        candidates have an embedding at all
+        """
+        has_embedding = np.array(
+            [c.get("embedding") is not None and len(c["embedding"]) > 0 for c in candidates],
+            dtype=bool,
+        )
+        candidate_models = np.empty(len(candidates), dtype=object)
+        for row, candidate in enumerate(candidates):
+            candidate_models[row] = candidate.get("embeddingModel")
+
+        job_side: Dict[Any, Tuple[np.ndarray, np.ndarray]] = {}
+        candidate_side: Dict[Any, np.ndarray] = {}
+        for model in dict.fromkeys(candidate_models[has_embedding]):
+            job_vectors = [_job_vector(job, model) for job in jobs]
+            if not any(v is not None and len(v) > 0 for v in job_vectors):
+                continue  # No job has a vector from this model: scores stay NaN
+            in_model = has_embedding & (candidate_models == model)
+            job_embeddings, job_has_embedding = self._embedding_matrix(job_vectors, model)
+            candidate_embeddings, _ = self._embedding_matrix(
+                [c.get("embedding") if ok else None for c, ok in zip(candidates, in_model)],
+                model,
+            )
+            if job_embeddings.shape[1] != candidate_embeddings.shape[1]:
+                raise ValueError(
+                    f"Job embeddings for {model} are {job_embeddings.shape[1]}-dim but "
+                    f"candidate embeddings are {candidate_embeddings.shape[1]}-dim"
+                )
+            job_side[model] = (job_embeddings, job_has_embedding)
+            candidate_side[model] = candidate_embeddings
+
+        return job_side, candidate_side, candidate_models, has_embedding
+
+    async def rank(
+        self,
+        jobs: List[Dict[str, Any]],
+        candidates: List[Dict[str, Any]],
+        top_k: int = 50,
+        model: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank all candidates for every job
+        model selects the embedding model for skill/cert matching
+        Returns one record per job with its top-k candidates and component scores
+        """
+        if not jobs or not candidates:
+            return [{"jobId": _record_id(job), "candidates": []} for job in jobs]
+
+        job_skills = [_names(job.get("requiredSkills")) for job in jobs]
+        job_certs = [_names(job.get("requiredCerts")) for job in jobs]
+        candidate_skills = [_names(c.get("skills")) for c in candidates]
+        candidate_certs = [_names(c.get("certifications")) for c in candidates]
+
+        skill_job_vocab, skill_candidate_vocab, skill_sim = await self._term_similarity(
+            job_skills, candidate_skills, model
+        )
+        cert_job_vocab, cert_candidate_vocab, cert_sim = await self._term_similarity(
+            job_certs, candidate_certs, model
+        )
+
+        (
+            job_embeddings, candidate_embeddings, candidate_models, candidate_has_embedding
+        ) = self._semantic_state(
+            jobs, candidates
+        )
+
+        state = {
+            "skill_sim": skill_sim,
+            "skill_mean": _mean_matrix(job_skills, skill_job_vocab),
+            "job_has_skills": np.array([bool(s) for s in job_skills]),
+            "cert_sim": cert_sim,
+            "cert_mean": _mean_matrix(job_certs, cert_job_vocab),
+            "job_has_certs": np.array([bool(c) for c in job_certs]),
+            "job_experience": np.array([_years(j.get("requiredExperience")) for j in jobs]),
+            "job_weights": np.array([
+                [
+                    job.get("skillsWeight", DEFAULT_WEIGHTS[0]),
+                    job.get("experienceWeight", DEFAULT_WEIGHTS[1]),
+                    job.get("certsWeight", DEFAULT_WEIGHTS[2]),
+                ]
+                for job in jobs
+            ], dtype=np.float64),
+            "job_embeddings": job_embeddings,
+            "top_k": top_k,
+        }
+
+        skill_index = _padded_index(candidate_skills, skill_candidate_vocab)
+        cert_index = _padded_index(candidate_certs, cert_candidate_vocab)
+        experience = np.array([_years(c.get("experience")) for c in candidates])
+
+        block_size = self.block_size or self._block_size(
+            len(jobs),
+            len(skill_job_vocab) * skill_index.shape[1]
+            + len(cert_job_vocab) * cert_index.shape[1],
+            _state_bytes(state),
+        )
+
+        def block(start: int) -> Dict[str, Any]:
+            end = start + block_size
+            return {
+                "start": start,
+                "skill_index": skill_index[start:end],
+                "cert_index": cert_index[start:end],
+                "experience": experience[start:end],
+                "embeddings": {
+                    model: matrix[start:end] for model, matrix in candidate_embeddings.items()
+                },
+                "embedding_model": candidate_models[start:end],
+                "has_embedding": candidate_has_embedding[start:end],
+            }
+
+        best_index = np.full((len(jobs), 0), -1, dtype=np.int64)
+        best_components = np.zeros((len(jobs), 0, len(COMPONENTS)))
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker, initargs=(state,)
+        ) as executor:
+            # Bounded submission keeps at most max_workers blocks in flight
+            in_flight = set()
+            for start in range(0, len(candidates), block_size):
+                in_flight.add(executor.submit(_score_block, block(start)))
+                if len(in_flight) >= self.max_workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        best_index, best_components = self._merge_top_k(
+                            best_index, best_components, *future.result(), top_k
+                        )
+            for future in in_flight:
+                best_index, best_components = self._merge_top_k(
+                    best_index, best_components, *future.result(), top_k
+                )
+
+        return self._format(jobs, candidates, best_index, best_components)
+
+    def _block_size(self, n_jobs: int, gathered_per_candidate: int, state_bytes: int) -> int:
+        """
+        Candidates per block so everything fits in memory_mb: the job-side
+        state (term similarity matrices etc.) held by the parent and copied
+        into every worker, plus per in-flight block the gathered term
+        similarities (float32) and job x block score arrays
+        """
+        budget = self.memory_mb * 1024 * 1024 - state_bytes * (self.max_workers + 1)
+        if budget <= 0:
+            raise ValueError(
+                f"--memory-mb {self.memory_mb} is too small: job-side state needs "
+                f"{state_bytes / 2**20:.0f} MB in each of {self.max_workers} workers "
+                f"plus the parent; raise --memory-mb or lower --workers"
+            )
+        per_candidate = gathered_per_candidate * 4 * 2 + n_jobs * len(COMPONENTS) * 8 * 2
+        return max(1, budget // self.max_workers // max(per_candidate, 1))
+
+    @staticmethod
+    def _merge_top_k(
+        best_index: np.ndarray,
+        best_components: np.ndarray,
+        index: np.ndarray,
+        components: np.ndarray,
+        top_k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        merged_index = np.concatenate([best_index, index], axis=1)
+        merged_components = np.concatenate([best_components, components], axis=1)
+        if merged_index.shape[1] <= top_k:
+            return merged_index, merged_components
+
+        keep = np.argpartition(-merged_components[:, :, 0], top_k - 1, axis=1)[:, :top_k]
+        return (
+            np.take_along_axis(merged_index, keep, axis=1),
+            np.take_along_axis(merged_components, keep[:, :, None], axis=1),
+        )
+
+    @staticmethod
+    def _format(
+        jobs: List[Dict[str, Any]],
+        candidates: List[Dict[str, Any]],
+        best_index: np.ndarray,
+        best_components: np.ndarray,
+    ) -> List[Dict[str, Any]]:
+        results = []
+        for row, job in enumerate(jobs):
+            order = np.argsort(-best_components[row, :, 0], kind="stable")
+            ranked = []
+            for rank, column in enumerate(order, start=1):
+                scores = best_components[row, column]
+                entry = {
+                    "rank": rank,
+                    "candidateId": _record_id(candidates[best_index[row, column]]),
+                }
+                for name, value in zip(COMPONENTS, scores):
+                    entry[name] = None if np.isnan(value) else round(float(value), 2)
+                ranked.append(entry)
+            results.append({"jobId": _record_id(job), "candidates": ranked})
+        return results
@@ -1,81 +1,256 @@
 """
 Embedding Service using Sentence-Transformers
 Generates semantic embeddings for text using cosine similarity
-Supports 1536-dim embeddings for OpenAI/Voyage compatibility
+Every embedding belongs to a registered model (id + dimension); local models
+are loaded lazily and evicted under a memory budget, OpenAI only on request
 """
 
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from typing import List, Union
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import asyncio
 import os
+import threading
+from app.utils.sections import SECTION_WEIGHTS
+
+
+class EmbeddingModelSpec(NamedTuple):
+    id: str
+    provider: str  # "local" (Sentence-Transformers) or "openai"
+    dimension: int
+    memory_mb: int  # Approximate resident size once loaded
+    languages: Tuple[str, ...]  # ("*",) = multilingual
+
+
+MODEL_REGISTRY: Dict[str, EmbeddingModelSpec] = {
+    spec.id: spec
+    for spec in [
+        EmbeddingModelSpec("all-MiniLM-L6-v2", "local", 384, 100, ("en",)),
+        EmbeddingModelSpec("paraphrase-multilingual-MiniLM-L12-v2", "local", 384, 480, ("*",)),
+        EmbeddingModelSpec("text-embedding-3-small", "openai", 1536, 0, ("*",)),
+    ]
+}
+
+DEFAULT_MODEL = os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+MULTILINGUAL_MODEL = os.getenv(
+    'EMBEDDING_MULTILINGUAL_MODEL', 'paraphrase-multilingual-MiniLM-L12-v2'
+)
+
+
+class IncompatibleEmbeddingError(ValueError):
+    """Raised when vectors from different embedding models are compared"""
+
+
+def check_compatible(
+    model_a: Optional[str], vector_a, model_b: Optional[str], vector_b
+) -> None:
+    """
+    Refuse to compare embeddings unless both are tagged with the same model
+    Same dimension is not enough: two 384-dim models live in different spaces
+    """
+    if not model_a or not model_b:
+        raise IncompatibleEmbeddingError("Embeddings must be tagged with their model")
+    if model_a != model_b:
+        raise IncompatibleEmbeddingError(
+            f"Cannot compare embeddings from {model_a} and {model_b}"
+        )
+    if len(vector_a) != len(vector_b):
+        raise IncompatibleEmbeddingError(
+            f"Embedding dimension mismatch for {model_a}: {len(vector_a)} vs {len(vector_b)}"
+        )
 
 
 class EmbeddingService:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        memory_budget_mb: Optional[int] = None,
+        cache_size: Optional[int] = None,
+    ):
         """
-        Initialize with a model
-        For 1536-dim embeddings, use OpenAI embeddings API or Voyage AI
+        Initialize with a default model from MODEL_REGISTRY
         Default: all-MiniLM-L6-v2 (384-dim) - lightweight and fast
-        For production: Use OpenAI text-embedding-3-large (3072-dim) or Voyage (1024-dim)
+        Other models (multilingual, OpenAI text-embedding-3-small) are used
+        only when a request asks for them, so stored vectors stay comparable
+        EMBEDDING_MEMORY_BUDGET_MB - total size of loaded local models (default 1024)
+        EMBEDDING_CACHE_SIZE - cached embeddings per model (default 10000)
         """
-        self.model = SentenceTransformer(model_name)
-        self.dimension = 384  # Default dimension
+        self.default_model = model_name
+        self.get_model_spec()  # Validate the default model
+        self.memory_budget_mb = memory_budget_mb or int(
+            os.getenv('EMBEDDING_MEMORY_BUDGET_MB', '1024')
+        )
+        self.cache_size = cache_size or int(os.getenv('EMBEDDING_CACHE_SIZE', '10000'))
+        
+        self._models: "OrderedDict[str, SentenceTransformer]" = OrderedDict()
+        self._models_lock = threading.Lock()
+        self._caches: Dict[str, "OrderedDict[str, np.ndarray]"] = {}
         
-        # Check if OpenAI is available for 1536-dim embeddings
-        self.use_openai = os.getenv('OPENAI_API_KEY') is not None
-        if self.use_openai:
+        self.openai_client = None
+        if os.getenv('OPENAI_API_KEY'):
             try:
                 import openai
                 self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-                self.dimension = 1536  # OpenAI text-embedding-3-small dimension
-            except:
-                self.use_openai = False
+            except ImportError:
+                pass
+
+    @property
+    def dimension(self) -> int:
+        return MODEL_REGISTRY[self.default_model].dimension
 
-    async def generate_embedding(self, text: str) -> np.ndarray:
+    def get_model_spec(self, model: Optional[str] = None) -> EmbeddingModelSpec:
+        """Registry entry for a model id (None = default model)"""
+        model = model or self.default_model
+        if model not in MODEL_REGISTRY:
+            raise ValueError(
+                f"Unknown embedding model '{model}'. Available: {', '.join(MODEL_REGISTRY)}"
+            )
+        return MODEL_REGISTRY[model]
+
+    def model_for_language(self, language: Optional[str]) -> str:
         """
-        Generate embedding vector for a single text
-        Uses OpenAI if available, otherwise falls back to Sentence-Transformers
+        Pick the model for text in a language: the default model when it
+        covers the language, otherwise the multilingual model
         """
-        if self.use_openai:
-            try:
-                # Use OpenAI for 1536-dim embeddings
-                response = self.openai_client.embeddings.create(
-                    model="text-embedding-3-small",  # 1536 dimensions
-                    input=text[:8000],  # Limit text length
-                )
-                return np.array(response.data[0].embedding)
-            except Exception as e:
-                print(f"OpenAI embedding failed, falling back to local model: {e}")
+        languages = MODEL_REGISTRY[self.default_model].languages
+        if not language or "*" in languages or language in languages:
+            return self.default_model
+        return self.get_model_spec(MULTILINGUAL_MODEL).id
+
+    def resume_models(self) -> List[str]:
+        """
+        Models that language routing can pick for resumes
+        Jobs are embedded with each, so every resume has a comparable job vector
+        """
+        models = [self.default_model]
+        if "*" not in MODEL_REGISTRY[self.default_model].languages:
+            models.append(self.get_model_spec(MULTILINGUAL_MODEL).id)
+        return models
+
+    def loaded_models(self) -> List[str]:
+        return list(self._models)
+
+    def _load_local_model(self, spec: EmbeddingModelSpec) -> SentenceTransformer:
+        """
+        Load a local model, evicting least recently used models to stay
+        within the memory budget (the requested model is always loaded)
+        """
+        with self._models_lock:
+            if spec.id in self._models:
+                self._models.move_to_end(spec.id)
+                return self._models[spec.id]
+            
+            used = sum(MODEL_REGISTRY[m].memory_mb for m in self._models)
+            while self._models and used + spec.memory_mb > self.memory_budget_mb:
+                evicted, _ = self._models.popitem(last=False)
+                used -= MODEL_REGISTRY[evicted].memory_mb
+                print(f"Evicted embedding model {evicted} (memory budget)")
+            
+            model = SentenceTransformer(spec.id)
+            self._models[spec.id] = model
+            return model
+
+    async def _encode(self, spec: EmbeddingModelSpec, texts: List[str]) -> np.ndarray:
+        """Encode texts with a model, without caching"""
+        if spec.provider == "openai":
+            if self.openai_client is None:
+                raise ValueError(f"Model {spec.id} requires OPENAI_API_KEY")
+            response = self.openai_client.embeddings.create(
+                model=spec.id,
+                input=[t[:8000] for t in texts],  # Limit text length
+            )
+            return np.array([item.embedding for item in response.data])
         
-        # Fallback to Sentence-Transformers
         loop = asyncio.get_event_loop()
-        embedding = await loop.run_in_executor(
-            None, self.model.encode, text
+        return await loop.run_in_executor(
+            None, lambda: self._load_local_model(spec).encode(texts)
         )
-        return embedding
 
-    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+    async def generate_embedding(self, text: str, model: Optional[str] = None) -> np.ndarray:
+        """
+        Generate embedding vector for a single text
+        """
+        embeddings = await self.generate_embeddings([text], model)
+        return embeddings[0]
+
+    async def generate_embeddings(
+        self, texts: List[str], model: Optional[str] = None
+    ) -> np.ndarray:
         """
         Generate embeddings for multiple texts (batch processing)
+        Texts already embedded with the same model come from its cache
         """
-        if self.use_openai:
-            try:
-                # Batch OpenAI embeddings
-                response = self.openai_client.embeddings.create(
-                    model="text-embedding-3-small",
-                    input=[t[:8000] for t in texts],
-                )
-                return np.array([item.embedding for item in response.data])
-            except Exception as e:
-                print(f"OpenAI batch embedding failed, falling back: {e}")
+        spec = self.get_model_spec(model)
+        cache = self._caches.setdefault(spec.id, OrderedDict())
         
-        # Fallback to Sentence-Transformers
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(
-            None, self.model.encode, texts
+        found = {}
+        for text in texts:
+            if text in cache:
+                cache.move_to_end(text)
+                found[text] = cache[text]
+        
+        missing = list(dict.fromkeys(t for t in texts if t not in found))
+        if missing:
+            embeddings = await self._encode(spec, missing)
+            for text, embedding in zip(missing, embeddings):
+                found[text] = embedding
+                cache[text] = embedding
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        
+        if not texts:
+            return np.zeros((0, spec.dimension))
+        return np.array([found[text] for text in texts])
+
+    async def generate_section_embeddings(
+        self, sections_list: List[Dict[str, str]], model: Optional[str] = None
+    ) -> List[Dict[str, np.ndarray]]:
+        """
+        Embed every section of every resume in a single batch call
+        """
+        keys = [
+            (i, name)
+            for i, sections in enumerate(sections_list)
+            for name, text in sections.items()
+            if text
+        ]
+        if not keys:
+            return [{} for _ in sections_list]
+        
+        embeddings = await self.generate_embeddings(
+            [sections_list[i][name] for i, name in keys], model
         )
-        return embeddings
+        
+        result: List[Dict[str, np.ndarray]] = [{} for _ in sections_list]
+        for (i, name), embedding in zip(keys, embeddings):
+            result[i][name] = np.asarray(embedding)
+        return result
+
+    def combine_section_embeddings(
+        self,
+        section_embeddings: Dict[str, np.ndarray],
+        weights: Optional[Dict[str, float]] = None,
+    ) -> np.ndarray:
+        """
+        Weighted mean of unit-normalized section embeddings
+        Experience text outweighs contact/boilerplate sections (SECTION_WEIGHTS)
+        """
+        if not section_embeddings:
+            raise ValueError("No section embeddings to combine")
+        weights = weights or SECTION_WEIGHTS
+        combined = None
+        for name, embedding in section_embeddings.items():
+            norm = np.linalg.norm(embedding)
+            if norm == 0:
+                continue
+            weighted = embedding / norm * weights.get(name, 0.0)
+            combined = weighted if combined is None else combined + weighted
+        
+        if combined is None or np.linalg.norm(combined) == 0:
+            # No weighted sections: plain mean
+            return np.mean(list(section_embeddings.values()), axis=0)
+        return combined / np.linalg.norm(combined)
 
     def cosine_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
@@ -0,0 +1,269 @@
+"""
+OCR Service for scanned resumes
+Runs Tesseract (via PyMuPDF) on image-only pages in a bounded process pool,
+so OCR never blocks text-PDF parsing
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+from app.utils.sections import Line, page_lines
+
+
+def needs_ocr(page, lines: List[Line]) -> bool:
+    """A page needs OCR when it has images but no text lines"""
+    return not lines and bool(page.get_images())
+
+
+def page_hash(doc, page) -> str:
+    """
+    Content hash of a page: its drawing commands and raw image streams
+    Identical scans hit the cache even when re-uploaded in another PDF
+    """
+    digest = hashlib.sha256(page.read_contents())
+    for image in page.get_images():
+        digest.update(doc.xref_stream_raw(image[0]))
+    return digest.hexdigest()
+
+
+def _ocr_page(pdf_bytes: bytes, language: str, dpi: int) -> List[Line]:
+    """
+    OCR the single page of a PDF (runs in a worker process)
+    """
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        page = doc[0]
+        textpage = page.get_textpage_ocr(language=language, dpi=dpi, full=True)
+        return page_lines(page, textpage)
+    finally:
+        doc.close()
+
+
+def _worker_loop(conn) -> None:
+    """Worker process: OCR pages sent over the pipe until it closes"""
+    while True:
+        try:
+            pdf_bytes, language, dpi = conn.recv()
+        except EOFError:
+            break
+        try:
+            conn.send(("ok", _ocr_page(pdf_bytes, language, dpi)))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class _OCRWorker:
+    """
+    One OCR process driven over a pipe
+    Unlike a ProcessPoolExecutor worker, it can be killed when a page hangs
+    """
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def ocr(self, pdf_bytes: bytes, language: str, dpi: int, timeout: float) -> List[Line]:
+        self.conn.send((pdf_bytes, language, dpi))
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"OCR exceeded {timeout:.1f}s")
+        status, payload = self.conn.recv()
+        if status == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class _Deadline:
+    """Per-document deadline that starts when its first page starts OCR"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._expires: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        with self._lock:
+            if self._expires is None:
+                self._expires = time.monotonic() + self.timeout
+            return self._expires - time.monotonic()
+
+
+class OCRService:
+    # Spawned workers do not inherit the server's threads or loaded models
+    _mp_context = multiprocessing.get_context("spawn")
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cache_size: Optional[int] = None,
+    ):
+        """
+        Configure the OCR stage (overridable via environment):
+        OCR_WORKERS - worker processes (default 2)
+        OCR_TIMEOUT_SECONDS - per-document timeout (default 60), counted from
+            when the document's first page starts OCR, not from submission
+        OCR_CACHE_SIZE - OCR'd pages kept in memory (default 256)
+        OCR_LANGUAGE / OCR_DPI - Tesseract language and render resolution
+        """
+        self.max_workers = max_workers or int(os.getenv('OCR_WORKERS', '2'))
+        self.timeout = timeout or float(os.getenv('OCR_TIMEOUT_SECONDS', '60'))
+        self.cache_size = cache_size or int(os.getenv('OCR_CACHE_SIZE', '256'))
+        self.language = os.getenv('OCR_LANGUAGE', 'eng')
+        self.dpi = int(os.getenv('OCR_DPI', '300'))
+
+        # Tesseract is optional: without it scanned pages stay empty
+        self.available = (
+            shutil.which('tesseract') is not None
+            or os.getenv('TESSDATA_PREFIX') is not None
+        )
+
+        # One driver thread per worker process: a page waiting for a thread
+        # is queued, and its clock starts only once a worker picks it up
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._workers: "queue.Queue[_OCRWorker]" = queue.Queue()
+        self._all_workers: List[_OCRWorker] = []
+        self._workers_lock = threading.Lock()
+        self._cache: "OrderedDict[str, List[Line]]" = OrderedDict()
+
+    def _get_threads(self) -> ThreadPoolExecutor:
+        # Created lazily so text-only workloads never spawn workers
+        with self._workers_lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._threads
+
+    def _acquire_worker(self) -> _OCRWorker:
+        try:
+            return self._workers.get_nowait()
+        except queue.Empty:
+            # Threads never outnumber workers, so this stays within max_workers
+            worker = _OCRWorker(self._mp_context)
+            with self._workers_lock:
+                self._all_workers.append(worker)
+            return worker
+
+    def _replace_worker(self, worker: _OCRWorker) -> None:
+        worker.kill()
+        with self._workers_lock:
+            self._all_workers.remove(worker)
+
+    def _run_page(self, pdf_bytes: bytes, deadline: _Deadline) -> Optional[List[Line]]:
+        """
+        OCR one page in a worker process (runs in a driver thread)
+        Returns None when the document's deadline has passed; a page that
+        overruns it has its worker killed so the slot is freed
+        """
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            return None
+
+        worker = self._acquire_worker()
+        try:
+            lines = worker.ocr(pdf_bytes, self.language, self.dpi, remaining)
+        except TimeoutError:
+            self._replace_worker(worker)
+            return None
+        except (EOFError, OSError):
+            # Worker crashed
+            self._replace_worker(worker)
+            raise
+        except RuntimeError:
+            # The page failed but the worker is healthy: keep it
+            self._workers.put(worker)
+            raise
+        self._workers.put(worker)
+        return lines
+
+    def _cache_get(self, key: str) -> Optional[List[Line]]:
+        lines = self._cache.get(key)
+        if lines is not None:
+            self._cache.move_to_end(key)
+        return lines
+
+    def _cache_put(self, key: str, lines: List[Line]) -> None:
+        self._cache[key] = lines
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def ocr_pages(self, doc, page_numbers: List[int]) -> Dict[int, List[Line]]:
+        """
+        OCR the given pages of an open document in parallel
+        Cached pages are returned directly; pages not finished within the
+        per-document timeout are returned empty, and completed pages cached
+        """
+        results: Dict[int, List[Line]] = {}
+        if not self.available:
+            print("OCR skipped: Tesseract is not installed")
+            return {number: [] for number in page_numbers}
+
+        pending = {}
+        for number in page_numbers:
+            key = page_hash(doc, doc[number])
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[number] = cached
+                continue
+
+            single = fitz.open()
+            single.insert_pdf(doc, from_page=number, to_page=number)
+            pending[number] = (key, single.tobytes())
+            single.close()
+
+        if not pending:
+            return results
+
+        loop = asyncio.get_running_loop()
+        threads = self._get_threads()
+        deadline = _Deadline(self.timeout)
+        futures = {
+            number: loop.run_in_executor(threads, self._run_page, pdf_bytes, deadline)
+            for number, (_, pdf_bytes) in pending.items()
+        }
+
+        timed_out = 0
+        for number, future in futures.items():
+            try:
+                lines = await future
+            except Exception as e:
+                print(f"OCR failed for page {number}: {e}")
+                results[number] = []
+                continue
+            if lines is None:
+                timed_out += 1
+                results[number] = []
+                continue
+            self._cache_put(pending[number][0], lines)
+            results[number] = lines
+
+        if timed_out:
+            print(f"OCR timed out for {timed_out} page(s) after {self.timeout}s")
+        return results
+
+    def shutdown(self) -> None:
+        with self._workers_lock:
+            threads, self._threads = self._threads, None
+            workers, self._all_workers = self._all_workers, []
+        if threads is not None:
+            threads.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.kill()
+        self._workers = queue.Queue()
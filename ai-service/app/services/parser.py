@@ -4,14 +4,40 @@ Extracts text, skills, experience, certifications from PDF resumes
 """
 
 import fitz  # PyMuPDF
+import asyncio
 import re
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from app.models.resume import ResumeParseResponse
-from app.utils.nlp import extract_skills, normalize_dates, extract_experience_years
+from app.services.ocr import OCRService, needs_ocr
+from app.utils.sections import HEADER_SECTION, page_lines, segment_lines
+from app.utils.nlp import (
+    extract_skills,
+    normalize_dates,
+    extract_experience_years,
+    extract_experience_years_batch,
+    extract_date_ranges,
+    detect_language,
+)
+
+
+# Joins the sections an extractor reads. _normalize_text removes "|", so it
+# never occurs inside a section and no pattern can match across it
+SECTION_BOUNDARY = " | "
+
+# Sections each extractor reads; the full text is used when none are present
+EXTRACTOR_SECTIONS = {
+    "skills": ("skills", "experience", "summary"),
+    "experience": ("summary", "experience"),
+    "certifications": ("certifications", "summary"),
+    "education": ("education",),
+    "work_history": ("experience",),
+    "personal_info": (HEADER_SECTION,),
+}
 
 
 class ResumeParser:
-    def __init__(self):
+    def __init__(self, ocr_service: Optional[OCRService] = None):
+        self.ocr_service = ocr_service or OCRService()
         self.skill_keywords = [
             "python", "javascript", "react", "node.js", "typescript", "java",
             "sql", "aws", "docker", "kubernetes", "git", "agile", "scrum",
@@ -25,45 +51,116 @@ class ResumeParser:
         Parse PDF resume and extract structured data
         """
         try:
-            # Open PDF from bytes
-            doc = fitz.open(stream=pdf_content, filetype="pdf")
-            
-            # Extract text from all pages
-            full_text = ""
-            for page in doc:
-                full_text += page.get_text()
-            
-            doc.close()
-            
-            # Normalize text
-            full_text = self._normalize_text(full_text)
-            
-            # Extract structured data
-            skills = extract_skills(full_text, self.skill_keywords)
-            experience = extract_experience_years(full_text)
-            certifications = self._extract_certifications(full_text)
-            education = self._extract_education(full_text)
-            work_history = self._extract_work_history(full_text)
-            personal_info = self._extract_personal_info(full_text)
-            
-            return ResumeParseResponse(
-                text=full_text,
-                skills=skills,
-                experience=experience,
-                certifications=certifications,
-                education=education,
-                work_history=work_history,
-                personal_info=personal_info,
+            full_text, sections = await self._extract_sections(pdf_content)
+            experience = extract_experience_years(
+                self._section_text(full_text, sections, "experience")
+            )
+            return self._build_response(full_text, sections, experience)
+        except Exception as e:
+            raise Exception(f"PDF parsing error: {str(e)}")
+
+    async def parse_pdfs(self, pdf_contents: List[bytes]) -> List[ResumeParseResponse]:
+        """
+        Parse a batch of PDF resumes
+        Experience timelines for the whole batch are merged in one vectorized pass
+        """
+        try:
+            # Documents run concurrently so scanned pages share the OCR pool
+            extracted = await asyncio.gather(
+                *[self._extract_sections(content) for content in pdf_contents]
             )
+            experiences = extract_experience_years_batch([
+                self._section_text(full_text, sections, "experience")
+                for full_text, sections in extracted
+            ])
+            return [
+                self._build_response(full_text, sections, experience)
+                for (full_text, sections), experience in zip(extracted, experiences)
+            ]
         except Exception as e:
             raise Exception(f"PDF parsing error: {str(e)}")
 
+    async def _extract_sections(self, pdf_content: bytes) -> Tuple[str, Dict[str, str]]:
+        """
+        Extract normalized full text and per-section text from a PDF
+        Lines and font metadata are read once and reused for both;
+        image-only pages are sent to the OCR stage
+        """
+        # Open PDF from bytes
+        doc = fitz.open(stream=pdf_content, filetype="pdf")
+        
+        try:
+            # Extract lines with font metadata from all pages
+            pages = []
+            scanned = []
+            for page in doc:
+                page_text = page_lines(page)
+                if needs_ocr(page, page_text):
+                    scanned.append(page.number)
+                pages.append(page_text)
+            
+            # Text PDFs never touch the OCR pool
+            if scanned:
+                ocr_results = await self.ocr_service.ocr_pages(doc, scanned)
+                for number, page_text in ocr_results.items():
+                    pages[number] = page_text
+        finally:
+            doc.close()
+        
+        lines = [line for page_text in pages for line in page_text]
+        
+        full_text = self._normalize_text("\n".join(line.text for line in lines))
+        sections = {
+            name: self._normalize_text(text)
+            for name, text in segment_lines(lines).items()
+        }
+        return full_text, sections
+
+    def _section_text(self, full_text: str, sections: Dict[str, str], extractor: str) -> str:
+        """Text an extractor should scan: its relevant sections, or the full text"""
+        texts = [sections[name] for name in EXTRACTOR_SECTIONS[extractor] if sections.get(name)]
+        return SECTION_BOUNDARY.join(texts) if texts else full_text
+
+    def _build_response(
+        self, full_text: str, sections: Dict[str, str], experience: Optional[int]
+    ) -> ResumeParseResponse:
+        """Run each extractor over its relevant section"""
+        skills = extract_skills(
+            self._section_text(full_text, sections, "skills"), self.skill_keywords
+        )
+        certifications = self._extract_certifications(
+            self._section_text(full_text, sections, "certifications")
+        )
+        education = self._extract_education(
+            self._section_text(full_text, sections, "education")
+        )
+        work_history = self._extract_work_history(
+            self._section_text(full_text, sections, "work_history")
+        )
+        personal_info = self._extract_personal_info(
+            self._section_text(full_text, sections, "personal_info")
+        )
+        
+        return ResumeParseResponse(
+            text=full_text,
+            sections=sections or None,
+            language=detect_language(full_text),
+            skills=skills,
+            experience=experience,
+            certifications=certifications,
+            education=education,
+            work_history=work_history,
+            personal_info=personal_info,
+        )
+
     def _normalize_text(self, text: str) -> str:
         """Normalize extracted text"""
         # Remove excessive whitespace
         text = re.sub(r'\s+', ' ', text)
-        # Remove special characters but keep punctuation
-        text = re.sub(r'[^\w\s\.\,\;\:\!\?\-\(\)]', '', text)
+        # Unify dashes so date ranges survive ("2019 – 2021" -> "2019 - 2021")
+        text = re.sub(r'[–—]', '-', text)
+        # Remove special characters but keep punctuation and date separators
+        text = re.sub(r'[^\w\s\.\,\;\:\!\?\-\(\)/]', '', text)
         return text.strip()
 
     def _extract_certifications(self, text: str) -> List[str]:
@@ -108,18 +205,17 @@ class ResumeParser:
 
     def _extract_work_history(self, text: str) -> Optional[List[Dict[str, Any]]]:
         """Extract work history"""
-        # This is a simplified extraction - can be enhanced with NLP libraries
-        # Look for date patterns and job titles
-        work_pattern = r'(\d{4}|\w+\s+\d{4})\s*[-–—]\s*(\d{4}|\w+\s+\d{4}|Present|Current)'
-        matches = re.findall(work_pattern, text)
+        # Date ranges only - job titles can be added with NLP libraries
+        ranges = extract_date_ranges(text)
         
-        if matches:
+        if ranges:
             return [
                 {
-                    "start_date": match[0],
-                    "end_date": match[1],
+                    "start_date": start_text,
+                    "end_date": end_text,
+                    "duration_months": end - start,
                 }
-                for match in matches[:5]  # Limit to 5 most recent
+                for start_text, end_text, start, end in ranges
             ]
         return None
 
@@ -4,10 +4,14 @@ Implements the mathematical scoring formula:
 Score = (S_match × W_s) + (E_match × W_e) + (C_match × W_c)
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import numpy as np
-from app.services.embedding import EmbeddingService
-from app.models.score import ScoreResponse, Weights
+from app.services.embedding import EmbeddingService, check_compatible
+from app.models.score import MatchDetails, ScoreResponse, TermMatch, Weights
+
+
+# Similarity (0-100 scale) at which a requirement counts as matched
+MATCH_THRESHOLD = 80.0
 
 
 class ScoringService:
@@ -23,15 +27,36 @@ class ScoringService:
         job_experience: Optional[int],
         job_certs: List[str],
         weights: Weights,
+        include_explanation: bool = True,
+        model: Optional[str] = None,
+        candidate_embedding: Optional[List[float]] = None,
+        candidate_embedding_model: Optional[str] = None,
+        job_embedding: Optional[List[float]] = None,
+        job_embedding_model: Optional[str] = None,
     ) -> ScoreResponse:
         """
         Calculate semantic match score using the formula:
         Score = (S_match × W_s) + (E_match × W_e) + (C_match × W_c)
+        Per-requirement matches are always returned; prose only on request
+        Stored resume/job embeddings, if given, must come from the same model
         """
         
+        # Check before any embedding work so mismatches fail fast
+        semantic_score = None
+        if candidate_embedding and job_embedding:
+            semantic_score = self._calculate_semantic_score(
+                candidate_embedding, candidate_embedding_model,
+                job_embedding, job_embedding_model,
+            )
+        
+        # Embed all skills and certs in one batch
+        term_embeddings = await self._embed_terms(
+            candidate_skills + job_skills + candidate_certs + job_certs, model
+        )
+        
         # 1. Skills Score (S_match) - Semantic matching using embeddings
-        skills_score = await self._calculate_skills_score(
-            candidate_skills, job_skills
+        skills_score, skill_matches = self._match_terms(
+            candidate_skills, job_skills, term_embeddings
         )
         
         # 2. Experience Score (E_match)
@@ -40,8 +65,8 @@ class ScoringService:
         )
         
         # 3. Certifications Score (C_match) - Semantic matching
-        certs_score = await self._calculate_certs_score(
-            candidate_certs, job_certs
+        certs_score, cert_matches = self._match_terms(
+            candidate_certs, job_certs, term_embeddings
         )
         
         # 4. Calculate overall score using weights
@@ -52,55 +77,101 @@ class ScoringService:
         )
         
         # Generate explanation
-        explanation = self._generate_explanation(
-            skills_score, experience_score, certs_score, weights
-        )
+        explanation = None
+        if include_explanation:
+            explanation = self._generate_explanation(
+                skills_score, experience_score, certs_score, weights
+            )
         
         return ScoreResponse(
             overallScore=round(overall_score, 2),
             skillsScore=round(skills_score, 2),
             experienceScore=round(experience_score, 2),
             certsScore=round(certs_score, 2),
+            semanticScore=round(semantic_score, 2) if semantic_score is not None else None,
             explanation=explanation,
+            match=MatchDetails(skills=skill_matches, certifications=cert_matches),
         )
 
-    async def _calculate_skills_score(
-        self, candidate_skills: List[str], job_skills: List[str]
-    ) -> float:
+    async def _embed_terms(
+        self, terms: List[str], model: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
         """
-        Calculate skills match score using semantic similarity
-        Uses cosine similarity on embeddings instead of keyword matching
+        Unit-normalized embedding for each distinct term
         """
-        if not job_skills:
-            return 100.0  # No requirements = perfect match
-        
-        if not candidate_skills:
-            return 0.0
+        unique_terms = list(dict.fromkeys(terms))
+        if not unique_terms:
+            return {}
         
-        # Generate embeddings for all skills
-        all_skills = list(set(candidate_skills + job_skills))
-        embeddings = await self.embedding_service.generate_embeddings(all_skills)
-        
-        # Create mapping
-        skill_to_embedding = dict(zip(all_skills, embeddings))
-        
-        # Calculate semantic matches
-        matched_scores = []
-        for job_skill in job_skills:
-            job_embedding = skill_to_embedding[job_skill]
-            best_match = 0.0
-            
-            for candidate_skill in candidate_skills:
-                candidate_embedding = skill_to_embedding[candidate_skill]
-                similarity = self.embedding_service.cosine_similarity(
-                    job_embedding, candidate_embedding
-                )
-                best_match = max(best_match, similarity)
-            
-            matched_scores.append(best_match)
-        
-        # Average of all required skills
-        return sum(matched_scores) / len(matched_scores) if matched_scores else 0.0
+        embeddings = np.asarray(
+            await self.embedding_service.generate_embeddings(unique_terms, model), dtype=float
+        )
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = np.divide(
+            embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0
+        )
+        return dict(zip(unique_terms, embeddings))
+
+    def _match_terms(
+        self,
+        candidate_terms: List[str],
+        job_terms: List[str],
+        term_embeddings: Dict[str, np.ndarray],
+    ) -> Tuple[float, List[TermMatch]]:
+        """
+        Match each required term to the candidate's most similar term
+        Uses cosine similarity on embeddings instead of keyword matching:
+        one job x candidate similarity matrix gives both the score
+        (mean of best matches) and the per-requirement match records
+        """
+        if not job_terms:
+            return 100.0, []  # No requirements = perfect match
+        
+        if not candidate_terms:
+            return 0.0, [
+                TermMatch(requirement=term, similarity=0.0, matched=False)
+                for term in job_terms
+            ]
+        
+        job_matrix = np.array([term_embeddings[t] for t in job_terms])
+        candidate_matrix = np.array([term_embeddings[t] for t in candidate_terms])
+        
+        # Cosine similarity normalized to 0-100 scale; zero vectors score 0
+        similarity = (job_matrix @ candidate_matrix.T + 1) / 2 * 100
+        similarity[~job_matrix.any(axis=1), :] = 0.0
+        similarity[:, ~candidate_matrix.any(axis=1)] = 0.0
+        
+        best = similarity.argmax(axis=1)
+        best_scores = similarity[np.arange(len(job_terms)), best]
+        
+        matches = [
+            TermMatch(
+                requirement=term,
+                bestMatch=candidate_terms[index],
+                similarity=round(float(score), 2),
+                matched=bool(score >= MATCH_THRESHOLD),
+            )
+            for term, index, score in zip(job_terms, best, best_scores)
+        ]
+        
+        # Average of all required terms
+        return float(best_scores.mean()), matches
+
+    def _calculate_semantic_score(
+        self,
+        candidate_embedding: List[float],
+        candidate_model: Optional[str],
+        job_embedding: List[float],
+        job_model: Optional[str],
+    ) -> float:
+        """
+        Cosine similarity of resume and job embeddings (0-100)
+        Raises IncompatibleEmbeddingError for vectors from different models
+        """
+        check_compatible(candidate_model, candidate_embedding, job_model, job_embedding)
+        return self.embedding_service.cosine_similarity(
+            np.asarray(candidate_embedding), np.asarray(job_embedding)
+        )
 
     def _calculate_experience_score(
         self, candidate_exp: Optional[int], job_exp: Optional[int]
@@ -122,40 +193,6 @@ class ScoringService:
         # Proportional score (e.g., 2 years for 4 years required = 50%)
         return (candidate_exp / job_exp) * 100.0
 
-    async def _calculate_certs_score(
-        self, candidate_certs: List[str], job_certs: List[str]
-    ) -> float:
-        """
-        Calculate certifications match score using semantic similarity
-        """
-        if not job_certs:
-            return 100.0  # No requirements = perfect match
-        
-        if not candidate_certs:
-            return 0.0
-        
-        # Similar to skills: use semantic matching
-        all_certs = list(set(candidate_certs + job_certs))
-        embeddings = await self.embedding_service.generate_embeddings(all_certs)
-        
-        cert_to_embedding = dict(zip(all_certs, embeddings))
-        
-        matched_scores = []
-        for job_cert in job_certs:
-            job_embedding = cert_to_embedding[job_cert]
-            best_match = 0.0
-            
-            for candidate_cert in candidate_certs:
-                candidate_embedding = cert_to_embedding[candidate_cert]
-                similarity = self.embedding_service.cosine_similarity(
-                    job_embedding, candidate_embedding
-                )
-                best_match = max(best_match, similarity)
-            
-            matched_scores.append(best_match)
-        
-        return sum(matched_scores) / len(matched_scores) if matched_scores else 0.0
-
     def _generate_explanation(
         self,
         skills_score: float,
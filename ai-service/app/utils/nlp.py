@@ -4,8 +4,38 @@ Date normalization, skill extraction, experience parsing
 """
 
 import re
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
+import numpy as np
+
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# Full month names or abbreviations only ("Marketing 2015" is not March)
+_MONTH = (
+    r'(?:january|february|march|april|may|june|july|august|september|october'
+    r'|november|december|sept|jan|feb|mar|apr|jun|jul|aug|sep|oct|nov|dec)\b\.?'
+)
+_DATE = rf'(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})'
+_END = rf'(?:{_DATE}|present|current|now|today)'
+DATE_RANGE_PATTERN = re.compile(
+    rf'\b({_DATE})\s*(?:-|–|—|to|until)\s*({_END})\b',
+    re.IGNORECASE,
+)
+
+MONTH_YEAR_PATTERN = re.compile(r'([a-z]+)\.?\s+(\d{4})')
+NUMERIC_DATE_PATTERN = re.compile(r'(\d{1,2})/(\d{4})')
+YEAR_PATTERN = re.compile(r'\d{4}')
+
+MIN_YEAR = 1950
+
+
+def _current_month() -> int:
+    now = datetime.now()
+    return now.year * 12 + now.month - 1
 
 
 def extract_skills(text: str, skill_keywords: List[str]) -> List[str]:
@@ -49,8 +79,14 @@ def normalize_dates(text: str) -> str:
 def extract_experience_years(text: str) -> Optional[int]:
     """
     Extract years of experience from resume text
-    Looks for patterns like "5 years", "5+ years", "5 yrs"
+    Looks for patterns like "5 years", "5+ years", "5 yrs",
+    falling back to the work-history timeline
     """
+    return extract_experience_years_batch([text])[0]
+
+
+def _stated_experience_years(text: str) -> Optional[int]:
+    """Years of experience stated explicitly in the text, if any"""
     patterns = [
         r'(\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?experience',
         r'experience[:\s]+(\d+)\+?\s*(?:years?|yrs?)',
@@ -62,7 +98,201 @@ def extract_experience_years(text: str) -> Optional[int]:
         if match:
             years = int(match.group(1))
             return years
-    
-    # Fallback: calculate from work history dates if available
-    # This is simplified - can be enhanced with date parsing
     return None
+
+
+def parse_month(
+    token: str, is_end: bool = False, current: Optional[int] = None
+) -> Optional[int]:
+    """
+    Convert a resume date token to a month index (year * 12 + month - 1)
+    End dates are exclusive: "Dec 2020" -> Jan 2021, "2020" -> Jan 2020,
+    so "2018 - 2020" counts as 2 years and "Jan 2020 - Dec 2020" as 12 months
+    """
+    token = token.strip().lower()
+    if current is None:
+        current = _current_month()
+
+    if token in ("present", "current", "now", "today"):
+        return current + 1 if is_end else None
+
+    match = MONTH_YEAR_PATTERN.fullmatch(token)
+    if match:
+        month = MONTHS.get(match.group(1)[:3])
+        year = int(match.group(2))
+    else:
+        match = NUMERIC_DATE_PATTERN.fullmatch(token)
+        if match:
+            month = int(match.group(1))
+            year = int(match.group(2))
+        elif YEAR_PATTERN.fullmatch(token):
+            month = None
+            year = int(token)
+        else:
+            return None
+
+    if not MIN_YEAR <= year <= current // 12 + 1:
+        return None
+
+    if month is None:
+        # Year only: start of year for both ends (end is exclusive)
+        index = year * 12
+    elif 1 <= month <= 12:
+        index = year * 12 + month - 1 + (1 if is_end else 0)
+    else:
+        return None
+
+    return min(index, current + 1)
+
+
+def extract_date_ranges(text: str) -> List[Tuple[str, str, int, int]]:
+    """
+    Extract all work-history date ranges from text
+    Returns (start_text, end_text, start_month, end_month) tuples with
+    month indices from parse_month; malformed or inverted ranges are skipped
+    A year-only end counts its year in full after a month-precision start
+    ("Mar 2020 - 2020" = 10 months, "Oct 2019 - 2020" = 15 months) and in
+    a single-year range ("2020 - 2020" = 12 months); "2018 - 2020" stays
+    24 months
+    """
+    current = _current_month()
+    ranges = []
+    for match in DATE_RANGE_PATTERN.finditer(text):
+        start = parse_month(match.group(1), current=current)
+        end = parse_month(match.group(2), is_end=True, current=current)
+        if (
+            start is not None and end is not None
+            and YEAR_PATTERN.fullmatch(match.group(2).strip())
+            and (
+                not YEAR_PATTERN.fullmatch(match.group(1).strip())
+                or end // 12 == start // 12
+            )
+        ):
+            end = min(end + 12, current + 1)
+        if start is None or end is None or end <= start:
+            continue
+        ranges.append((match.group(1), match.group(2), start, end))
+    return ranges
+
+
+def merge_experience_months(
+    doc_ids: np.ndarray, starts: np.ndarray, ends: np.ndarray, n_docs: int
+) -> np.ndarray:
+    """
+    Total months covered by the union of [start, end) intervals per document
+    Vectorized over the whole batch: intervals are sorted by (doc, start) and
+    shifted into disjoint per-document bands, so a single running maximum of
+    end dates gives each interval's non-overlapping contribution
+    """
+    if len(doc_ids) == 0:
+        return np.zeros(n_docs, dtype=np.int64)
+
+    order = np.lexsort((starts, doc_ids))
+    docs = doc_ids[order]
+    offset = docs * (int(ends.max()) + 1)
+    s = starts[order] + offset
+    e = ends[order] + offset
+
+    reach = np.maximum.accumulate(e)
+    previous = np.empty_like(reach)
+    previous[0] = s[0]
+    previous[1:] = reach[:-1]
+
+    covered = np.clip(e - np.maximum(s, previous), 0, None)
+    return np.bincount(docs, weights=covered, minlength=n_docs).astype(np.int64)
+
+
+def timeline_experience_months(texts: List[str]) -> List[Optional[int]]:
+    """
+    Months of experience from work-history timelines for many texts
+    Overlapping roles are merged so concurrent jobs are not double counted
+    Returns None for texts without any parseable date range
+    """
+    doc_ids, starts, ends = [], [], []
+    for i, text in enumerate(texts):
+        for _, _, start, end in extract_date_ranges(text):
+            doc_ids.append(i)
+            starts.append(start)
+            ends.append(end)
+
+    months = merge_experience_months(
+        np.array(doc_ids, dtype=np.int64),
+        np.array(starts, dtype=np.int64),
+        np.array(ends, dtype=np.int64),
+        len(texts),
+    )
+    has_ranges = np.bincount(np.array(doc_ids, dtype=np.int64), minlength=len(texts)) > 0
+
+    return [
+        m if found else None
+        for m, found in zip(months.tolist(), has_ranges.tolist())
+    ]
+
+
+def extract_experience_years_batch(texts: List[str]) -> List[Optional[int]]:
+    """
+    Extract years of experience for a batch of resume texts
+    Explicit statements ("5+ years of experience") take precedence;
+    otherwise experience is computed from the merged work-history timeline
+    """
+    stated = [_stated_experience_years(text) for text in texts]
+    pending = [i for i, years in enumerate(stated) if years is None]
+    months = timeline_experience_months([texts[i] for i in pending])
+
+    for i, m in zip(pending, months):
+        if m is not None:
+            stated[i] = int(round(m / 12))
+    return stated
+
+
+# Most frequent function words per language, for lightweight detection
+STOPWORDS = {
+    "en": {"the", "and", "of", "to", "in", "for", "with", "on", "is", "as", "at", "by", "from"},
+    "es": {"de", "la", "que", "el", "en", "los", "del", "las", "por", "con", "para", "una", "y"},
+    "fr": {"le", "la", "les", "des", "et", "en", "du", "une", "pour", "dans", "sur", "avec", "au"},
+    "de": {"der", "die", "und", "in", "den", "von", "zu", "das", "mit", "für", "auf", "des", "im"},
+    "pt": {"de", "que", "do", "da", "em", "os", "para", "com", "uma", "dos", "das", "não", "e"},
+    "it": {"di", "che", "il", "la", "per", "con", "del", "della", "una", "gli", "nel", "sono", "e"},
+    "nl": {"de", "het", "een", "van", "en", "in", "op", "voor", "met", "zijn", "te", "dat", "bij"},
+}
+
+# Try to use langdetect (optional dependency)
+try:
+    from langdetect import DetectorFactory, detect as _langdetect
+    # langdetect samples randomly: seed it so a resume always routes to the
+    # same embedding model (upload and re-embed must agree)
+    DetectorFactory.seed = 0
+    LANGDETECT_AVAILABLE = True
+except ImportError:
+    _langdetect = None
+    LANGDETECT_AVAILABLE = False
+
+
+def detect_language(text: str) -> str:
+    """
+    Detect the dominant language of resume text (ISO 639-1 code)
+    Uses langdetect if installed, otherwise stopword counts; text mostly in a
+    non-Latin script returns "other"; empty text defaults to "en"
+    """
+    words = re.findall(r'[^\W\d_]+', text.lower())
+    if not words:
+        return "en"
+
+    if LANGDETECT_AVAILABLE:
+        try:
+            return _langdetect(text).split("-")[0]
+        except Exception:
+            pass
+
+    letters = "".join(words)
+    non_latin = sum(1 for c in letters if ord(c) > 0x24F)
+    if non_latin > len(letters) / 2:
+        return "other"
+
+    counts = {
+        language: sum(1 for word in words if word in stopwords)
+        for language, stopwords in STOPWORDS.items()
+    }
+    best = max(counts, key=counts.get)
+    # Ties and stopword-free text (e.g. skill lists) stay English
+    return best if counts[best] > counts["en"] else "en"
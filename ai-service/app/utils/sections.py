@@ -0,0 +1,175 @@
+"""
+Resume section segmentation
+Splits PyMuPDF text lines into sections (summary, experience, skills,
+education, certifications) using heading text and font metadata
+"""
+
+import re
+from statistics import median
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+SECTION_HEADINGS = {
+    "summary": [
+        "summary", "professional summary", "profile", "professional profile",
+        "about", "about me", "objective", "career objective", "overview",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience",
+        "employment", "employment history", "work history", "career history",
+        "relevant experience",
+    ],
+    "skills": [
+        "skills", "technical skills", "core skills", "key skills",
+        "competencies", "core competencies", "technologies", "tech stack",
+    ],
+    "education": [
+        "education", "academic background", "academics", "qualifications",
+        "academic qualifications", "education and training",
+    ],
+    "certifications": [
+        "certifications", "certification", "certificates", "licenses",
+        "licenses and certifications", "licenses & certifications",
+    ],
+}
+
+# Keywords for styled (bold/larger) headings that are not exact aliases,
+# e.g. "Professional Experience & Projects"
+SECTION_KEYWORDS = {
+    "summary": ["summary", "objective", "profile"],
+    "experience": ["experience", "employment"],
+    "skills": ["skill", "competenc"],
+    "education": ["education", "academic"],
+    "certifications": ["certif", "licens"],
+}
+
+# Text before the first heading (name, contact details)
+HEADER_SECTION = "header"
+
+# Relative weight of each section in the combined resume embedding:
+# experience text dominates, contact boilerplate barely counts
+SECTION_WEIGHTS = {
+    "experience": 0.4,
+    "skills": 0.25,
+    "summary": 0.15,
+    "education": 0.1,
+    "certifications": 0.05,
+    HEADER_SECTION: 0.05,
+}
+
+_ALIASES = {
+    alias: section
+    for section, aliases in SECTION_HEADINGS.items()
+    for alias in aliases
+}
+
+MAX_HEADING_WORDS = 5
+
+
+class Line(NamedTuple):
+    text: str
+    size: float
+    bold: bool
+
+
+def page_lines(page, textpage=None) -> List[Line]:
+    """
+    Read text lines with font metadata from a PyMuPDF page
+    Pass an OCR textpage to read recognized text instead of the text layer
+    A line counts as bold only if all of its non-blank spans are bold
+    """
+    lines = []
+    for block in page.get_text("dict", textpage=textpage)["blocks"]:
+        if block.get("type") != 0:
+            continue
+        for line in block["lines"]:
+            spans = [span for span in line["spans"] if span["text"].strip()]
+            if not spans:
+                continue
+            lines.append(Line(
+                text="".join(span["text"] for span in spans),
+                size=max(span["size"] for span in spans),
+                bold=all(
+                    span["flags"] & 16 or "bold" in span["font"].lower()
+                    for span in spans
+                ),
+            ))
+    return lines
+
+
+def _heading_key(text: str) -> str:
+    """Lowercase heading text without decoration ("WORK HISTORY:" -> "work history")"""
+    text = re.sub(r'[^\w\s&]', ' ', text.lower())
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def inline_section(line: Line) -> Optional[Tuple[str, str]]:
+    """Return (section, content) for a labelled line ("Skills: Python, SQL")"""
+    head, sep, rest = line.text.partition(":")
+    if sep and _heading_key(head) in _ALIASES:
+        return _ALIASES[_heading_key(head)], rest.strip()
+    return None
+
+
+def classify_heading(line: Line, body_size: float) -> Optional[Tuple[str, str]]:
+    """
+    Return (section, inline_content) if the line is a section heading
+    Handles exact aliases ("Skills"), styled inline headings
+    ("Skills: Python, SQL") and styled headings containing a section keyword
+    """
+    key = _heading_key(line.text)
+    if key in _ALIASES:
+        return _ALIASES[key], ""
+
+    styled = line.bold or line.size > body_size * 1.1
+    inline = inline_section(line)
+    if inline and styled:
+        return inline
+
+    if styled and 0 < len(key.split()) <= MAX_HEADING_WORDS:
+        for section, keywords in SECTION_KEYWORDS.items():
+            if any(keyword in key for keyword in keywords):
+                return section, ""
+    return None
+
+
+def segment_lines(lines: List[Line]) -> Dict[str, str]:
+    """
+    Group lines into sections in a single pass
+    A plain labelled line ("Technologies: Python, AWS" inside a role) adds
+    its content to that section without leaving the current one, unless no
+    section has started yet
+    Returns an empty dict when no headings are found, so callers can fall
+    back to the full text
+    """
+    if not lines:
+        return {}
+
+    body_size = median(line.size for line in lines)
+    current = HEADER_SECTION
+    found_heading = False
+    sections: Dict[str, List[str]] = {}
+
+    for line in lines:
+        heading = classify_heading(line, body_size)
+        inline = None if heading else inline_section(line)
+        if inline and not found_heading:
+            heading = inline
+        elif inline:
+            section, content = inline
+            if content:
+                sections.setdefault(section, []).append(content)
+        if heading:
+            current, content = heading
+            found_heading = True
+            if content:
+                sections.setdefault(current, []).append(content)
+            continue
+        sections.setdefault(current, []).append(line.text)
+
+    if not found_heading:
+        return {}
+    return {
+        section: "\n".join(texts)
+        for section, texts in sections.items()
+    }
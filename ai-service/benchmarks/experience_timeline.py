@@ -0,0 +1,75 @@
+"""
+Benchmark: work-history experience extraction on a synthetic resume corpus
+Times date-range extraction, then compares a per-resume Python interval
+merge against the vectorized batch merge
+
+Usage: python -m benchmarks.experience_timeline [n_resumes]
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from app.utils.nlp import extract_date_ranges, merge_experience_months
+
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+               "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def synthetic_resume(rng: random.Random) -> str:
+    """Build resume-like text with 1-8 possibly overlapping roles"""
+    lines = ["Jane Doe - Software Engineer - jane@example.com"]
+    year = rng.randint(1995, 2015)
+    for _ in range(rng.randint(1, 8)):
+        start = f"{rng.choice(MONTH_NAMES)} {year}"
+        year += rng.randint(0, 4)
+        end = "Present" if year >= 2024 else f"{rng.choice(MONTH_NAMES)} {year}"
+        lines.append(f"Senior Engineer, Acme Corp {start} - {end}")
+        lines.append("Built REST APIs in Python and React. " * rng.randint(1, 5))
+    return "\n".join(lines)
+
+
+def merge_python(intervals):
+    """Reference per-resume merge: sort, then sweep"""
+    total, reach = 0, None
+    for start, end in sorted(intervals):
+        if reach is None or start >= reach:
+            total += end - start
+            reach = end
+        elif end > reach:
+            total += end - reach
+            reach = end
+    return total
+
+
+def main(n: int = 20000) -> None:
+    rng = random.Random(42)
+    corpus = [synthetic_resume(rng) for _ in range(n)]
+
+    start = time.perf_counter()
+    ranges = [extract_date_ranges(text) for text in corpus]
+    extract_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [merge_python([(s, e) for _, _, s, e in r]) for r in ranges]
+    python_time = time.perf_counter() - start
+
+    doc_ids = np.array([i for i, r in enumerate(ranges) for _ in r], dtype=np.int64)
+    starts = np.array([s for r in ranges for _, _, s, _ in r], dtype=np.int64)
+    ends = np.array([e for r in ranges for _, _, _, e in r], dtype=np.int64)
+
+    start = time.perf_counter()
+    months = merge_experience_months(doc_ids, starts, ends, n)
+    batch_time = time.perf_counter() - start
+
+    assert months.tolist() == expected
+    print(f"resumes:          {n} ({len(doc_ids)} date ranges)")
+    print(f"range extraction: {extract_time:.3f}s")
+    print(f"merge per-resume: {python_time:.4f}s")
+    print(f"merge batched:    {batch_time:.4f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
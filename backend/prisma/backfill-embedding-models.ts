@@ -0,0 +1,124 @@
+/**
+ * Backfill embeddingModel on vectors stored before embeddings were tagged
+ * Atlas vector search filters on embeddingModel, so untagged candidates and
+ * jobs are invisible to it until this has run
+ *
+ * - Candidates and jobs get the legacy model for their vector's dimension
+ * - Jobs with a description are re-embedded for every resume model, keeping
+ *   their legacy vector under its model so legacy candidates still match
+ *
+ * Usage: npm run prisma:backfill-embeddings
+ */
+
+import { PrismaClient } from '@prisma/client';
+import axios from 'axios';
+import { config } from '../src/config/env.js';
+import { logger } from '../src/utils/logger.js';
+import { embeddingModelOf } from '../src/services/vector-search.service.js';
+
+const prisma = new PrismaClient();
+
+const BATCH_SIZE = 500;
+
+const untagged = {
+  OR: [{ embeddingModel: null }, { embeddingModel: { isSet: false } }],
+};
+
+async function backfillCandidates(): Promise<void> {
+  let tagged = 0;
+  let skipped = 0;
+  let cursor: string | undefined;
+
+  for (;;) {
+    // Page by id: tagged rows drop out of the filter as we go
+    const candidates = await prisma.candidate.findMany({
+      where: { ...untagged, ...(cursor ? { id: { gt: cursor } } : {}) },
+      select: { id: true, embedding: true },
+      orderBy: { id: 'asc' },
+      take: BATCH_SIZE,
+    });
+    if (!candidates.length) {
+      break;
+    }
+    cursor = candidates[candidates.length - 1].id;
+
+    for (const candidate of candidates) {
+      const embeddingModel = embeddingModelOf(candidate.embedding, null);
+      if (!embeddingModel) {
+        // No vector yet (the resume worker embeds it) or an unknown size
+        skipped++;
+        continue;
+      }
+      await prisma.candidate.update({
+        where: { id: candidate.id },
+        data: { embeddingModel },
+      });
+      tagged++;
+    }
+  }
+
+  logger.info('Candidate embeddings backfilled', { tagged, skipped });
+}
+
+async function backfillJobs(): Promise<void> {
+  let updated = 0;
+  let failed = 0;
+
+  const jobs = await prisma.job.findMany({
+    select: {
+      id: true,
+      description: true,
+      embedding: true,
+      embeddingModel: true,
+      embeddings: true,
+    },
+  });
+
+  for (const job of jobs) {
+    if (job.embeddingModel && job.embeddings) {
+      continue;
+    }
+
+    const legacyModel = embeddingModelOf(job.embedding, job.embeddingModel);
+    const data: any = {};
+    if (legacyModel) {
+      data.embeddingModel = legacyModel;
+    }
+
+    if (job.description) {
+      try {
+        const response = await axios.post(`${config.aiService.url}/api/job/embed`, {
+          description: job.description,
+        });
+        data.embedding = response.data.embedding;
+        data.embeddingModel = response.data.embeddingModel;
+        data.embeddings = {
+          ...(legacyModel ? { [legacyModel]: job.embedding } : {}),
+          ...response.data.embeddings,
+        };
+      } catch (error) {
+        logger.error('Failed to re-embed job', { jobId: job.id, error: String(error) });
+        failed++;
+      }
+    }
+
+    if (Object.keys(data).length) {
+      await prisma.job.update({ where: { id: job.id }, data });
+      updated++;
+    }
+  }
+
+  logger.info('Job embeddings backfilled', { updated, failed });
+}
+
+async function main(): Promise<void> {
+  await backfillCandidates();
+  await backfillJobs();
+}
+
+main()
+  .catch((error) => {
+    logger.error('Embedding backfill failed', { error: String(error) });
+    process.exitCode = 1;
+  })
+  .finally(() => prisma.$disconnect());
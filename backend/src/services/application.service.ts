@@ -95,6 +95,7 @@ export const applicationService = {
         skillsScore: scores.skillsScore,
         experienceScore: scores.experienceScore,
         certsScore: scores.certsScore,
+        matchDetails: scores.matchDetails as any,
         vectorSimilarity,
       },
     });
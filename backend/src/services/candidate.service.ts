@@ -115,6 +115,7 @@ export const candidatesService = {
         experience: application.experienceScore,
         certifications: application.certsScore,
         vectorSimilarity: application.vectorSimilarity,
+        matchDetails: application.matchDetails,
       } : null,
     };
   },
@@ -42,12 +42,17 @@ export const jobsService = {
   async create(data: any) {
     // Generate embedding for job description if not provided
     let embedding = data.embedding;
+    let embeddingModel = data.embeddingModel;
+    let embeddings = data.embeddings;
     if (!embedding && data.description) {
       try {
         const response = await axios.post(`${config.aiService.url}/api/job/embed`, {
           description: data.description,
         });
         embedding = response.data.embedding;
+        embeddingModel = response.data.embeddingModel;
+        // One vector per resume model, so non-English candidates stay comparable
+        embeddings = response.data.embeddings;
       } catch (error) {
         console.error('Failed to generate job embedding:', error);
       }
@@ -66,6 +71,8 @@ export const jobsService = {
         requiredExperience: data.requiredExperience,
         requiredCerts: data.requiredCerts || [],
         embedding: embedding, // Vector embedding for Atlas Vector Search
+        embeddingModel: embeddingModel,
+        embeddings: embeddings,
         createdBy: data.createdBy || 'system',
         status: data.status || 'DRAFT',
       },
@@ -80,6 +87,8 @@ export const jobsService = {
           description: data.description,
         });
         data.embedding = response.data.embedding;
+        data.embeddingModel = response.data.embeddingModel;
+        data.embeddings = response.data.embeddings;
       } catch (error) {
         console.error('Failed to regenerate job embedding:', error);
       }
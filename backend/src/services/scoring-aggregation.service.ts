@@ -6,6 +6,7 @@
 import { MongoClient } from 'mongodb';
 import { config } from '../config/env.js';
 import { logger } from '../utils/logger.js';
+import { jobVectors } from './vector-search.service.js';
 import { PrismaClient } from '@prisma/client';
 
 const prisma = new PrismaClient();
@@ -25,6 +26,8 @@ export const scoringAggregationService = {
   /**
    * Score and rank candidates for a job using MongoDB aggregation pipeline
    * Combines vector search with custom weighting from Job Architect
+   * The pipeline runs once per embedding model, each over the candidates
+   * embedded with that model, and the rankings are merged
    */
   async scoreAndRankCandidates(jobId: string, limit: number = 50) {
     try {
@@ -32,8 +35,9 @@ export const scoringAggregationService = {
         where: { id: jobId },
       });
 
-      if (!job || !job.embedding) {
-        throw new Error('Job not found or missing embedding');
+      const vectors = job ? jobVectors(job) : {};
+      if (!job || !Object.keys(vectors).length) {
+        throw new Error('Job not found or missing embedding from a known model');
       }
 
       const client = await getMongoClient();
@@ -42,27 +46,24 @@ export const scoringAggregationService = {
       const applicationsCollection = db.collection('applications');
 
       // MongoDB Aggregation Pipeline with Vector Search + Custom Scoring
-      const pipeline = [
-      // Stage 1: Vector Search (only if embedding exists)
-      ...(job.embedding ? [{
-        $vectorSearch: {
-          index: config.mongodb.candidateVectorIndex,
-          path: 'embedding',
-          queryVector: job.embedding,
-          numCandidates: limit * 10,
-          limit: limit * 5,
+      const buildPipeline = (embeddingModel: string, queryVector: number[]) => [
+        // Stage 1: Vector Search over candidates embedded with the same model
+        {
+          $vectorSearch: {
+            index: config.mongodb.candidateVectorIndex,
+            path: 'embedding',
+            queryVector,
+            filter: { embeddingModel },
+            numCandidates: limit * 10,
+            limit: limit * 5,
+          },
         },
-      }] : []),
-        // Stage 2: Add vector similarity score (if from vector search)
-        ...(job.embedding ? [{
+        // Stage 2: Add vector similarity score
+        {
           $addFields: {
             vectorSimilarity: { $meta: 'vectorSearchScore' },
           },
-        }] : [{
-          $addFields: {
-            vectorSimilarity: 0,
-          },
-        }]),
+        },
         // Stage 3: Calculate skill match score (handle both string and object skills)
         {
           $addFields: {
@@ -256,7 +257,13 @@ export const scoringAggregationService = {
         },
       ];
 
-      const results = await candidatesCollection.aggregate(pipeline).toArray();
+      const results: any[] = [];
+      for (const [embeddingModel, queryVector] of Object.entries(vectors)) {
+        const pipeline = buildPipeline(embeddingModel, queryVector);
+        results.push(...(await candidatesCollection.aggregate(pipeline).toArray()));
+      }
+      results.sort((a, b) => b.overallScore - a.overallScore);
+      results.splice(limit);
 
       // Create or update applications with scores
       const applications = await Promise.all(
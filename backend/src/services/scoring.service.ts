@@ -1,9 +1,22 @@
 import axios from 'axios';
 import { config } from '../config/env.js';
 import { PrismaClient } from '@prisma/client';
+import { embeddingModelOf, jobVectors } from './vector-search.service.js';
 
 const prisma = new PrismaClient();
 
+interface TermMatch {
+  requirement: string;
+  bestMatch: string | null;
+  similarity: number;
+  matched: boolean;
+}
+
+interface MatchDetails {
+  skills: TermMatch[];
+  certifications: TermMatch[];
+}
+
 /**
  * Scoring Formula:
  * Score = (S_match × W_s) + (E_match × W_e) + (C_match × W_c)
@@ -21,6 +34,8 @@ export const scoringService = {
     skillsScore: number;
     experienceScore: number;
     certsScore: number;
+    semanticScore?: number | null;
+    matchDetails?: MatchDetails;
   }> {
     const [candidate, job] = await Promise.all([
       prisma.candidate.findUnique({ where: { id: candidateId } }),
@@ -31,6 +46,11 @@ export const scoringService = {
       throw new Error('Candidate or Job not found');
     }
 
+    // Send the job vector from the candidate's model, so the AI service
+    // compares like with like (and refuses if the tags still disagree)
+    const embeddingModel = embeddingModelOf(candidate.embedding, candidate.embeddingModel);
+    const jobEmbedding = embeddingModel ? jobVectors(job)[embeddingModel] : undefined;
+
     // Call AI service for semantic matching
     try {
       const response = await axios.post(`${config.aiService.url}/api/score`, {
@@ -38,20 +58,33 @@ export const scoringService = {
           skills: candidate.skills,
           experience: candidate.experience,
           certifications: candidate.certifications,
+          embedding: jobEmbedding ? candidate.embedding : undefined,
+          embeddingModel: jobEmbedding ? embeddingModel : undefined,
         },
         job: {
           requiredSkills: job.requiredSkills,
           requiredExperience: job.requiredExperience,
           requiredCerts: job.requiredCerts,
+          embedding: jobEmbedding,
+          embeddingModel: jobEmbedding ? embeddingModel : undefined,
         },
         weights: {
           skills: job.skillsWeight,
           experience: job.experienceWeight,
           certifications: job.certsWeight,
         },
+        // Only numeric scores are stored; skip prose generation
+        includeExplanation: false,
       });
 
-      const scores = response.data;
+      const scores = {
+        overallScore: response.data.overallScore,
+        skillsScore: response.data.skillsScore,
+        experienceScore: response.data.experienceScore,
+        certsScore: response.data.certsScore,
+        semanticScore: response.data.semanticScore,
+        matchDetails: response.data.match as MatchDetails | undefined,
+      };
 
       // Update application with scores
       const application = await prisma.application.findUnique({
@@ -71,6 +104,7 @@ export const scoringService = {
             skillsScore: scores.skillsScore,
             experienceScore: scores.experienceScore,
             certsScore: scores.certsScore,
+            matchDetails: scores.matchDetails as any,
           },
         });
       }
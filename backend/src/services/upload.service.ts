@@ -57,7 +57,8 @@ export const uploadService = {
           education: parsedData.education,
           workHistory: parsedData.work_history,
           resumeText: encryptedText,
-          embedding: parsedData.embedding, // 1536-dim vector from AI service
+          embedding: parsedData.embedding, // Vector from AI service
+          embeddingModel: parsedData.embeddingModel,
           status: 'APPLIED',
         },
       });
@@ -145,6 +146,7 @@ export const uploadService = {
             workHistory: parsedData.work_history,
             resumeText: encryptedText,
             embedding: parsedData.embedding,
+            embeddingModel: parsedData.embeddingModel,
             status: 'APPLIED',
           },
         });
@@ -22,6 +22,47 @@ async function getMongoClient(): Promise<MongoClient> {
   return mongoClient;
 }
 
+/**
+ * Models that produced embeddings stored before they were tagged, by dimension:
+ * the AI service used OpenAI when OPENAI_API_KEY was set, MiniLM otherwise
+ */
+export const LEGACY_EMBEDDING_MODELS: Record<number, string> = {
+  384: 'all-MiniLM-L6-v2',
+  1536: 'text-embedding-3-small',
+};
+
+/**
+ * Model of a stored embedding; untagged vectors count as the legacy model
+ * for their dimension (null when there is no vector or the size is unknown)
+ */
+export function embeddingModelOf(
+  embedding: number[] | null | undefined,
+  embeddingModel: string | null | undefined
+): string | null {
+  if (!embedding || !embedding.length) {
+    return null;
+  }
+  return embeddingModel || LEGACY_EMBEDDING_MODELS[embedding.length] || null;
+}
+
+/**
+ * Job description vectors keyed by embedding model
+ * Vectors from different models live in different spaces, so a candidate is
+ * only ever compared with the job vector from its own model
+ */
+export function jobVectors(job: {
+  embedding: number[];
+  embeddingModel: string | null;
+  embeddings: unknown;
+}): Record<string, number[]> {
+  const vectors: Record<string, number[]> = {};
+  const model = embeddingModelOf(job.embedding, job.embeddingModel);
+  if (model) {
+    vectors[model] = job.embedding;
+  }
+  return { ...vectors, ...((job.embeddings as Record<string, number[]> | null) || {}) };
+}
+
 export const vectorSearchService = {
   /**
    * Create vector search index on MongoDB Atlas
@@ -34,6 +75,10 @@ export const vectorSearchService = {
    *       "path": "embedding",
    *       "numDimensions": 384,
    *       "similarity": "cosine"
+   *     },
+   *     {
+   *       "type": "filter",
+   *       "path": "embeddingModel"
    *     }
    *   ]
    * }
@@ -41,6 +86,8 @@ export const vectorSearchService = {
   
   /**
    * Search candidates by job embedding using Atlas Vector Search
+   * Runs one search per embedding model, each restricted to candidates
+   * embedded with that model, and merges the results
    * @param jobId - Job ID to get embedding from
    * @param limit - Number of results to return
    * @returns Array of candidates with similarity scores
@@ -53,11 +100,12 @@ export const vectorSearchService = {
       // Get job embedding
       const job = await prisma.job.findUnique({
         where: { id: jobId },
-        select: { embedding: true },
+        select: { embedding: true, embeddingModel: true, embeddings: true },
       });
 
-      if (!job || !job.embedding) {
-        logger.warn(`Job ${jobId} has no embedding`);
+      const vectors = job ? jobVectors(job) : {};
+      if (!Object.keys(vectors).length) {
+        logger.warn(`Job ${jobId} has no embedding from a known model`);
         return [];
       }
 
@@ -65,38 +113,45 @@ export const vectorSearchService = {
       const db = client.db();
       const candidatesCollection = db.collection('candidates');
 
-      // MongoDB Atlas Vector Search aggregation
-      const pipeline = [
-        {
-          $vectorSearch: {
-            index: 'candidate_vector_index', // Must be created in Atlas UI
-            path: 'embedding',
-            queryVector: job.embedding,
-            numCandidates: limit * 10, // Search more candidates for better results
-            limit: limit,
+      const results: any[] = [];
+      for (const [embeddingModel, queryVector] of Object.entries(vectors)) {
+        // MongoDB Atlas Vector Search aggregation
+        const pipeline = [
+          {
+            $vectorSearch: {
+              index: 'candidate_vector_index', // Must be created in Atlas UI
+              path: 'embedding',
+              queryVector,
+              filter: { embeddingModel }, // Only vectors from the same model are comparable
+              numCandidates: limit * 10, // Search more candidates for better results
+              limit: limit,
+            },
           },
-        },
-        {
-          $project: {
-            _id: 1,
-            firstName: 1,
-            lastName: 1,
-            email: 1,
-            skills: 1,
-            experience: 1,
-            certifications: 1,
-            score: { $meta: 'vectorSearchScore' }, // Similarity score from Atlas
+          {
+            $project: {
+              _id: 1,
+              firstName: 1,
+              lastName: 1,
+              email: 1,
+              skills: 1,
+              experience: 1,
+              certifications: 1,
+              score: { $meta: 'vectorSearchScore' }, // Similarity score from Atlas
+            },
           },
-        },
-      ];
+        ];
 
-      const results = await candidatesCollection.aggregate(pipeline).toArray();
+        results.push(...(await candidatesCollection.aggregate(pipeline).toArray()));
+      }
 
-      return results.map((doc) => ({
-        candidateId: doc._id.toString(),
-        similarity: doc.score || 0,
-        score: (doc.score || 0) * 100, // Convert to 0-100 scale
-      }));
+      return results
+        .sort((a, b) => (b.score || 0) - (a.score || 0))
+        .slice(0, limit)
+        .map((doc) => ({
+          candidateId: doc._id.toString(),
+          similarity: doc.score || 0,
+          score: (doc.score || 0) * 100, // Convert to 0-100 scale
+        }));
     } catch (error) {
       logger.error('Vector search error', { error, jobId });
       throw error;
@@ -105,6 +160,8 @@ export const vectorSearchService = {
 
   /**
    * Search jobs by candidate embedding
+   * Only jobs whose indexed embedding comes from the candidate's model are
+   * searched (the jobs index holds each job's default-model vector)
    * @param candidateId - Candidate ID to get embedding from
    * @param limit - Number of results to return
    */
@@ -115,11 +172,13 @@ export const vectorSearchService = {
     try {
       const candidate = await prisma.candidate.findUnique({
         where: { id: candidateId },
-        select: { embedding: true },
+        select: { embedding: true, embeddingModel: true },
       });
 
-      if (!candidate || !candidate.embedding) {
-        logger.warn(`Candidate ${candidateId} has no embedding`);
+      const embeddingModel =
+        candidate && embeddingModelOf(candidate.embedding, candidate.embeddingModel);
+      if (!candidate || !embeddingModel) {
+        logger.warn(`Candidate ${candidateId} has no embedding from a known model`);
         return [];
       }
 
@@ -133,6 +192,7 @@ export const vectorSearchService = {
             index: 'job_vector_index', // Must be created in Atlas UI
             path: 'embedding',
             queryVector: candidate.embedding,
+            filter: { embeddingModel },
             numCandidates: limit * 10,
             limit: limit,
           },
@@ -163,7 +223,7 @@ export const vectorSearchService = {
 
   /**
    * Calculate skill gap using vector similarity
-   * Compares candidate embedding with job embedding
+   * Compares candidate embedding with the job embedding from the same model
    */
   async calculateSkillGap(jobId: string, candidateId: string): Promise<{
     overallSimilarity: number;
@@ -174,12 +234,20 @@ export const vectorSearchService = {
       prisma.candidate.findUnique({ where: { id: candidateId } }),
     ]);
 
-    if (!job || !candidate || !job.embedding || !candidate.embedding) {
+    if (!job || !candidate || !candidate.embedding.length) {
       throw new Error('Job or candidate missing embeddings');
     }
 
+    const candidateModel = embeddingModelOf(candidate.embedding, candidate.embeddingModel);
+    const jobEmbedding = candidateModel && jobVectors(job)[candidateModel];
+    if (!jobEmbedding) {
+      throw new Error(
+        `Job ${jobId} has no embedding from candidate model ${candidateModel ?? 'unknown'}`
+      );
+    }
+
     // Calculate cosine similarity
-    const similarity = this.cosineSimilarity(job.embedding, candidate.embedding);
+    const similarity = this.cosineSimilarity(jobEmbedding, candidate.embedding);
     const overallSimilarity = (similarity + 1) / 2 * 100; // Normalize to 0-100
 
     // Match individual skills (simplified - can be enhanced with skill-specific embeddings)
@@ -59,16 +59,20 @@ const worker = new Worker(
         message: 'Generating embeddings...',
       });
 
-      // Generate embedding if not exists
-      if (!candidate.embedding && candidate.resumeText) {
+      // Generate embedding if not exists (embedding is a list column, never null)
+      if (!candidate.embedding.length && candidate.resumeText) {
         const decryptedText = encryptionService.decrypt(candidate.resumeText);
+        // No model: the AI service picks it from the resume language, as at upload
         const embedResponse = await axios.post(`${config.aiService.url}/api/embed`, {
           text: decryptedText,
         });
 
         await prisma.candidate.update({
           where: { id: candidateId },
-          data: { embedding: embedResponse.data.embedding },
+          data: {
+            embedding: embedResponse.data.embedding,
+            embeddingModel: embedResponse.data.embeddingModel,
+          },
         });
       }
 